@@ -4,18 +4,34 @@ import json
 import time
 from decimal import Decimal
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Set, Tuple
-from dataclasses import dataclass, asdict
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+from dataclasses import dataclass, asdict, field
 import os
-from collections import defaultdict
-import re
+import random
+import signal
+from collections import Counter, defaultdict, deque
 import threading
 
+import aiohttp
 from telegram import Update, Bot
+from telegram.error import BadRequest, NetworkError, RetryAfter
 from telegram.ext import Application, CommandHandler, ContextTypes
-from hyperliquid.info import Info
 from hyperliquid.utils import constants
 
+try:
+    import orjson
+    json_loads = orjson.loads
+    
+    def json_dumps_pretty(obj) -> bytes:
+        """Serialize obj as 2-space indented JSON bytes"""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:  # Fall back to the stdlib parser if the wheel is unavailable
+    json_loads = json.loads
+    
+    def json_dumps_pretty(obj) -> bytes:
+        """Serialize obj as 2-space indented JSON bytes"""
+        return json.dumps(obj, indent=2).encode()
+
 # Configure logging with more detail
 logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s',
@@ -23,42 +39,275 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+ZERO = Decimal('0')
+SIZE_SCALE_EXPONENT = 8  # Hyperliquid sizes carry at most 8 decimals
+
+# Alert emoji per TradeEvent.trade_type
+TRADE_EMOJI = {"OPEN": "🟢", "CLOSE": "🔴", "INCREASE": "📈", "DECREASE": "📉"}
+
 # Production-grade configuration
 class BotConfig:
     # API timeouts and retries - more conservative for stability
     API_TIMEOUT_SECONDS = 45  # Increased for stability
     MAX_RETRIES = 5  # More retries for reliability
     RETRY_DELAY_BASE = 3  # Longer backoff for stability
+    MAX_RETRY_AFTER_SECONDS = 60  # Cap on a 429 Retry-After hint
     
     # Monitoring intervals - optimized for 10+ vaults
     VAULT_CHECK_INTERVAL = 120  # Longer interval for stability
-    VAULT_DELAY = 12  # More delay between vault checks
-    BATCH_SIZE = 3  # Process vaults in small batches
     
     # Performance thresholds
     MAX_API_RESPONSE_TIME = 20
-    MAX_CONCURRENT_OPERATIONS = 3  # Limit concurrent operations
+    MAX_CONCURRENT_OPERATIONS = 10  # In-flight vault requests per cycle (clearinghouseState is cheap in API weight)
+    
+    # Shared HTTP connection pool for Hyperliquid /info calls
+    HTTP_CONNECTION_LIMIT = 64
+    HTTP_KEEPALIVE_SECONDS = 75
+    HTTP_DNS_CACHE_SECONDS = 300
+    # Pacing for /info requests: Hyperliquid allows 1200 weight/min per IP and
+    # clearinghouseState costs 2, so stay under 10 requests/s including retries
+    API_RATE_PER_SECOND = 8
+    API_BURST = 10
     
     # Persistence with multiple fallbacks
     VAULT_DATA_FILE = "vault_data.json"
     BACKUP_FILE = "vault_data_backup.json"
     
     # Address validation
-    HYPERLIQUID_ADDRESS_PATTERN = re.compile(r'^0x[a-fA-F0-9]{40}$')
+    HYPERLIQUID_ADDRESS_BYTES = 20  # 0x followed by 40 hex characters
     
     # Rate limiting
     MIN_TIME_BETWEEN_SAVES = 5  # Seconds between saves to prevent spam
+    
+    # Confluence history - hard cap per coin on top of the time window
+    MAX_EVENTS_PER_COIN = 500
+    
+    # Size changes at or below this are rounding noise, not trades
+    SIZE_EPSILON = Decimal('1e-6')
+    SIZE_EPSILON_BY_COIN: Dict[str, Decimal] = {}  # Per-coin overrides
+    
+    # Telegram outbound limits - headroom under the 30 msg/sec cap
+    TELEGRAM_RATE_PER_SECOND = 25
+    TELEGRAM_BURST = 30
+    TELEGRAM_MAX_MESSAGE_LENGTH = 4000  # Hard limit is 4096
+    ALERT_SEPARATOR = "\n\n---\n\n"  # Between alerts coalesced into one message
+    ALERT_QUEUE_SIZE = 256  # Outbound alerts waiting for the sender task
+    ALERT_SEND_RETRIES = 3
+    ALERT_DRAIN_TIMEOUT = 10  # Seconds to flush queued alerts on shutdown
+    ALERT_BATCH_SIZE = 20  # Most queued alerts the sender merges in one pass
+    ALERT_BATCH_WAIT = 0.25  # Seconds the sender waits for more alerts to merge
+
+_MARKDOWN_V2_ESCAPES = str.maketrans({char: f'\\{char}' for char in '_*[]()~`>#+-=|{}.!'})
 
 def escape_markdown_v2(text: str) -> str:
     """Escape special characters for MarkdownV2 with better error handling"""
     if not isinstance(text, str):
         text = str(text)
-    escape_chars = ['_', '*', '[', ']', '(', ')', '~', '`', '>', '#', '+', '-', '=', '|', '{', '}', '.', '!']
-    for char in escape_chars:
-        text = text.replace(char, f'\\{char}')
+    return text.translate(_MARKDOWN_V2_ESCAPES)
+
+# Counts, thresholds and minutes are small non-negative ints; escape them once
+_SMALL_INT_MARKDOWN_V2 = tuple(escape_markdown_v2(str(i)) for i in range(1024))
+
+def escape_int(value: int) -> str:
+    """MarkdownV2-escaped int, from the precomputed table when small"""
+    if 0 <= value < len(_SMALL_INT_MARKDOWN_V2):
+        return _SMALL_INT_MARKDOWN_V2[value]
+    return escape_markdown_v2(str(value))
+
+# Static /start and /show_settings text, escaped once at import; only the
+# live fields are filled in per command
+WELCOME_MESSAGE_TEMPLATE = (
+    "🤖 *Advanced Hyperliquid Position Monitor v2\\.2*\n\n"
+    "*🆕 Production\\-Grade Features:*\n"
+    "• Thread\\-safe operations\n"
+    "• Atomic data persistence\n"
+    "• Concurrent polling for 10\\+ vaults\n"
+    "• Smart first\\-scan filtering\n"
+    "• Enhanced error recovery\n\n"
+    "*Commands:*\n"
+    "/add\\_vault \\<address\\> \\<name\\> \\- Add vault\n"
+    "/list\\_vaults \\- Show monitored vaults\n"
+    "/remove\\_vault \\<name\\> \\- Remove vault\n"
+    "/backup \\- Manual backup\n"
+    "/status \\- Bot status\n"
+    "/performance \\- API metrics\n"
+    "/setvaults \\<number\\> \\- Set confluence threshold\n"
+    "/set\\_window \\<minutes\\> \\- Set time window\n"
+    "/health \\- System health\n\n"
+    "*Current Status:*\n"
+    "• Vaults: {active_count}/{vault_count}\n"
+    "• Monitoring: {monitoring}\n"
+    "• Confluence: {confluence_threshold} vault\\(s\\)\n\n"
+    "🚀 Ready for production use\\!"
+)
+
+SETTINGS_MESSAGE_TEMPLATE = (
+    "⚙️ *Bot Settings v2\\.2*\n\n"
+    "*Status:* {status_icon} {status_text}\n"
+    "*Vaults:* {active_count}/{vault_count} active\n\n"
+    "*Detection Settings:*\n"
+    "• Confluence Threshold: {confluence_threshold} vault\\(s\\)\n"
+    "• Confluence Window: {confluence_window} minute\\(s\\)\n"
+    "• Anti\\-spam Cooldown: {cooldown} minute\\(s\\)\n\n"
+    "*Production Config:*\n"
+    f"• Check Interval: {escape_markdown_v2(str(BotConfig.VAULT_CHECK_INTERVAL))} seconds\n"
+    f"• Max Concurrent: {escape_markdown_v2(str(BotConfig.MAX_CONCURRENT_OPERATIONS))} vaults\n"
+    f"• Max Retries: {escape_markdown_v2(str(BotConfig.MAX_RETRIES))}\n"
+    f"• API Timeout: {escape_markdown_v2(str(BotConfig.API_TIMEOUT_SECONDS))}s\n\n"
+    "*Features:*\n"
+    "• Tracks: Position SIZE changes\n"
+    "• Thread\\-safe operations\n"
+    "• Atomic persistence\n"
+    "• Smart first\\-scan filtering"
+)
+
+def is_valid_address(address: str) -> bool:
+    """True for 0x followed by exactly 40 hex characters"""
+    if len(address) != 2 + 2 * BotConfig.HYPERLIQUID_ADDRESS_BYTES or not address.startswith('0x'):
+        return False
+    try:
+        # fromhex tolerates spaces, so also check the decoded length
+        return len(bytes.fromhex(address[2:])) == BotConfig.HYPERLIQUID_ADDRESS_BYTES
+    except ValueError:
+        return False
+
+def scale_size(size: Decimal) -> int:
+    """Convert a Decimal size to integer units of 10**-SIZE_SCALE_EXPONENT"""
+    return int(size.scaleb(SIZE_SCALE_EXPONENT))
+
+_SIZE_EPSILON_SCALED = scale_size(BotConfig.SIZE_EPSILON)
+_SIZE_EPSILON_SCALED_BY_COIN = {
+    coin: scale_size(epsilon) for coin, epsilon in BotConfig.SIZE_EPSILON_BY_COIN.items()
+}
+
+def size_epsilon_scaled(coin: str) -> int:
+    """Noise threshold for coin in scaled size units"""
+    return _SIZE_EPSILON_SCALED_BY_COIN.get(coin, _SIZE_EPSILON_SCALED)
+
+def position_size(positions: Dict[str, 'PositionData'], coin: str) -> Decimal:
+    """Size of coin in a position map, ZERO when the coin has no open position"""
+    position = positions.get(coin)
+    return position.size if position else ZERO
+
+def position_size_scaled(positions: Dict[str, 'PositionData'], coin: str) -> int:
+    """Integer-scaled size of coin in a position map, 0 when the coin has no open position"""
+    position = positions.get(coin)
+    return position.size_scaled if position else 0
+
+def positions_fingerprint(user_state: Optional[Dict]) -> Optional[int]:
+    """Cheap hash of the (coin, szi) pairs in a clearinghouse state, None if malformed"""
+    try:
+        return hash(tuple(
+            (p['position']['coin'], p['position'].get('szi'))
+            for p in (user_state or {}).get('assetPositions', ())
+        ))
+    except (KeyError, TypeError, AttributeError):
+        return None
+
+_clock_cache: Dict[str, Tuple[datetime, str]] = {}  # fmt -> (second, formatted)
+
+def format_clock(moment: datetime, fmt: str = '%H:%M:%S') -> str:
+    """strftime at second granularity, reusing the last string while the second is unchanged"""
+    second = moment.replace(microsecond=0)
+    cached = _clock_cache.get(fmt)
+    if cached is not None and cached[0] == second:
+        return cached[1]
+    text = second.strftime(fmt)
+    _clock_cache[fmt] = (second, text)
     return text
 
-@dataclass
+def retry_after_seconds(headers, default: float) -> float:
+    """Seconds to back off from a Retry-After header, or default if absent or unparseable"""
+    try:
+        delay = float(headers.get('Retry-After'))
+    except (TypeError, ValueError):
+        return default
+    return min(max(delay, 0.0), BotConfig.MAX_RETRY_AFTER_SECONDS)
+
+def split_message(text: str, limit: int = BotConfig.TELEGRAM_MAX_MESSAGE_LENGTH) -> List[str]:
+    """Split text into chunks of at most limit chars on paragraph, then line, boundaries"""
+    if len(text) <= limit:
+        return [text]
+    
+    chunks = []
+    current = ""
+    for paragraph in text.split("\n\n"):
+        candidate = f"{current}\n\n{paragraph}" if current else paragraph
+        if len(candidate) <= limit:
+            current = candidate
+            continue
+        if current:
+            chunks.append(current)
+        current = ""
+        
+        # Oversized paragraph - fall back to line boundaries, then a hard cut
+        for line in paragraph.split("\n"):
+            candidate = f"{current}\n{line}" if current else line
+            if len(candidate) <= limit:
+                current = candidate
+                continue
+            if current:
+                chunks.append(current)
+            while len(line) > limit:
+                chunks.append(line[:limit])
+                line = line[limit:]
+            current = line
+    if current:
+        chunks.append(current)
+    return chunks
+
+def coalesce_alerts(alerts: List[str], limit: int = BotConfig.TELEGRAM_MAX_MESSAGE_LENGTH) -> List[str]:
+    """Join alerts with ALERT_SEPARATOR into as few messages of at most limit chars as possible"""
+    batches = []
+    batch = ""
+    for alert in alerts:
+        candidate = f"{batch}{BotConfig.ALERT_SEPARATOR}{alert}" if batch else alert
+        if len(candidate) <= limit:
+            batch = candidate
+            continue
+        if batch:
+            batches.append(batch)
+        batch = alert
+    if batch:
+        batches.append(batch)
+    return batches
+
+class AsyncTokenBucket:
+    """Token bucket rate limiter usable as an async context manager"""
+    
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()  # Serialize waiters so tokens are handed out in order
+    
+    async def acquire(self):
+        """Wait until a token is available and consume it"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+    
+    def pause(self, seconds: float):
+        """Hold back every caller for at least seconds, e.g. after a 429"""
+        now = time.monotonic()
+        self._tokens = min(self._tokens + (now - self._updated) * self.rate, 1 - seconds * self.rate)
+        self._updated = now
+    
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+@dataclass(slots=True)
 class VaultInfo:
     address: str
     name: str
@@ -68,6 +317,13 @@ class VaultInfo:
     first_scan_completed: bool = False  # NEW: Track if initial scan is done
     total_api_calls: int = 0
     avg_response_time: float = 0.0
+    display_name_md: str = field(init=False, repr=False, default="")
+    display_address_md: str = field(init=False, repr=False, default="")
+    
+    def __post_init__(self):
+        # Name and address never change, so escape them for MarkdownV2 once
+        self.display_name_md = escape_markdown_v2(self.name)
+        self.display_address_md = escape_markdown_v2(f"{self.address[:8]}...{self.address[-6:]}")
     
     def __str__(self):
         return f"{self.name} ({self.address[:8]}...{self.address[-6:]})"
@@ -106,15 +362,16 @@ class VaultInfo:
             avg_response_time=data.get('avg_response_time', 0.0)
         )
 
-@dataclass
+@dataclass(slots=True)
 class PositionData:
     coin: str
     size: Decimal
     timestamp: datetime
     entry_price: Optional[Decimal] = None
     position_value: Optional[Decimal] = None
+    size_scaled: int = 0  # size * 10**SIZE_SCALE_EXPONENT, used for cheap diffing
     
-@dataclass
+@dataclass(slots=True)
 class TradeEvent:
     vault_name: str
     vault_address: str
@@ -122,6 +379,11 @@ class TradeEvent:
     old_size: Decimal
     new_size: Decimal
     timestamp: datetime
+    size_change_str: str = field(init=False, repr=False, default="")
+    
+    def __post_init__(self):
+        # Format once; alerts and confluence logging reuse the cached string
+        self.size_change_str = str(self.size_change)
     
     @property
     def size_change(self) -> Decimal:
@@ -146,6 +408,7 @@ class PerformanceMetrics:
     avg_response_time: float = 0.0
     last_reset: datetime = None
     vault_scan_times: Dict[str, float] = None
+    last_reset_monotonic: float = field(default_factory=time.monotonic)
     
     def __post_init__(self):
         if self.last_reset is None:
@@ -165,25 +428,51 @@ class ThreadSafeVaultData:
     def __init__(self):
         self._lock = threading.RLock()  # Reentrant lock for nested operations
         self._vaults: Dict[str, VaultInfo] = {}
+        # Immutable membership snapshot, rebuilt only when vaults are added/removed
+        self._snapshot: Tuple[VaultInfo, ...] = ()
+        self._vaults_by_address: Dict[str, VaultInfo] = {}  # Lowercased address -> vault
+        self._active_vaults: Tuple[VaultInfo, ...] = ()  # Rebuilt wherever VaultInfo.is_active flips
+        self._inactive_vaults: Tuple[VaultInfo, ...] = ()
+        self._first_scan_done: Set[str] = set()  # Addresses whose initial scan is complete
         self._previous_positions: Dict[str, Dict[str, PositionData]] = {}
-        self._last_alerts: Dict[str, Dict[str, datetime]] = {}
-        self._trade_events: List[TradeEvent] = []
+        self._position_fingerprints: Dict[str, int] = {}  # Address -> fingerprint of last processed scan
+        self._cooldown_expiry: Dict[Tuple[str, str], float] = {}  # (address, coin) -> monotonic expiry
+        self._events_by_coin: Dict[str, deque] = {}  # coin -> deque[TradeEvent] in time order
+        self._vault_counts_by_coin: Dict[str, Counter] = {}  # coin -> vault name -> events in window
         self._is_monitoring = False
         self._performance = PerformanceMetrics()
-        self._last_save_time = 0
+        self._last_save_time = float('-inf')  # time.monotonic() of the last save
+        self._dirty = False  # Routine stat changes waiting for the next periodic flush
         
         # Settings
         self._confluence_threshold = 1
         self._confluence_window_minutes = 10
         self._cooldown_minutes = 5
+        self._cooldown_seconds = self._cooldown_minutes * 60  # Kept in step with _cooldown_minutes
         
         # Load persisted data
         self._load_data()
     
-    @property
-    def vaults(self) -> Dict[str, VaultInfo]:
-        with self._lock:
-            return self._vaults.copy()
+    def snapshot(self) -> Tuple[VaultInfo, ...]:
+        """Lock-free read of the current vault membership"""
+        return self._snapshot
+    
+    def _rebuild_snapshot(self):
+        """Rebuild the membership snapshot - caller must hold the lock"""
+        self._snapshot = tuple(self._vaults.values())
+        self._vaults_by_address = {v.address.lower(): v for v in self._snapshot}
+        self._rebuild_active()
+    
+    def _rebuild_active(self):
+        """Split the snapshot into active and inactive tuples - caller must hold the lock"""
+        self._active_vaults = tuple(v for v in self._snapshot if v.is_active)
+        self._inactive_vaults = tuple(v for v in self._snapshot if not v.is_active)
+    
+    def _set_active(self, vault: VaultInfo, active: bool):
+        """Flip a vault's active flag and keep the cached active tuple in step - caller must hold the lock"""
+        if vault.is_active != active:
+            vault.is_active = active
+            self._rebuild_active()
     
     @property
     def is_monitoring(self) -> bool:
@@ -200,6 +489,11 @@ class ThreadSafeVaultData:
         with self._lock:
             return self._performance
     
+    @performance.setter
+    def performance(self, value: PerformanceMetrics):
+        with self._lock:
+            self._performance = value
+    
     @property
     def confluence_threshold(self) -> int:
         with self._lock:
@@ -208,6 +502,8 @@ class ThreadSafeVaultData:
     @confluence_threshold.setter
     def confluence_threshold(self, value: int):
         with self._lock:
+            if value == self._confluence_threshold:
+                return  # Re-sending the current value - nothing to persist
             self._confluence_threshold = value
             self._safe_save()
     
@@ -219,6 +515,8 @@ class ThreadSafeVaultData:
     @confluence_window_minutes.setter
     def confluence_window_minutes(self, value: int):
         with self._lock:
+            if value == self._confluence_window_minutes:
+                return  # Re-sending the current value - nothing to persist
             self._confluence_window_minutes = value
             self._safe_save()
     
@@ -229,13 +527,22 @@ class ThreadSafeVaultData:
     
     def _safe_save(self):
         """Rate-limited save to prevent excessive disk I/O"""
-        current_time = time.time()
+        current_time = time.monotonic()
         if current_time - self._last_save_time < BotConfig.MIN_TIME_BETWEEN_SAVES:
-            return  # Skip save to prevent spam
+            self._dirty = True  # Skip save to prevent spam - the periodic flush picks it up
+            return
         
         self._last_save_time = current_time
         self._save_data()
     
+    def flush_if_dirty(self) -> bool:
+        """Persist routine stat changes accumulated since the last save"""
+        with self._lock:
+            if not self._dirty:
+                return False
+            self._save_data()
+            return True
+    
     def _save_data(self):
         """Save vault data with atomic write and backup"""
         try:
@@ -250,8 +557,8 @@ class ThreadSafeVaultData:
             
             # Atomic write: write to temp file first, then rename
             temp_file = f"{BotConfig.VAULT_DATA_FILE}.tmp"
-            with open(temp_file, 'w') as f:
-                json.dump(vault_data, f, indent=2)
+            with open(temp_file, 'wb') as f:
+                f.write(json_dumps_pretty(vault_data))
             
             # Create backup of existing file
             if os.path.exists(BotConfig.VAULT_DATA_FILE):
@@ -262,6 +569,7 @@ class ThreadSafeVaultData:
             
             # Atomic rename
             os.rename(temp_file, BotConfig.VAULT_DATA_FILE)
+            self._dirty = False  # Only once the new file is in place - a failed write stays pending
             
             logger.info(f"Safely saved {len(self._vaults)} vaults to persistent storage")
             
@@ -284,8 +592,8 @@ class ThreadSafeVaultData:
             # Try primary file
             if os.path.exists(BotConfig.VAULT_DATA_FILE):
                 try:
-                    with open(BotConfig.VAULT_DATA_FILE, 'r') as f:
-                        data = json.load(f)
+                    with open(BotConfig.VAULT_DATA_FILE, 'rb') as f:
+                        data = json_loads(f.read())
                     loaded_from = BotConfig.VAULT_DATA_FILE
                 except Exception as e:
                     logger.warning(f"Failed to load primary file: {e}")
@@ -293,8 +601,8 @@ class ThreadSafeVaultData:
             # Try backup file
             if not data and os.path.exists(BotConfig.BACKUP_FILE):
                 try:
-                    with open(BotConfig.BACKUP_FILE, 'r') as f:
-                        data = json.load(f)
+                    with open(BotConfig.BACKUP_FILE, 'rb') as f:
+                        data = json_loads(f.read())
                     loaded_from = BotConfig.BACKUP_FILE
                     logger.info("Loaded from backup file")
                 except Exception as e:
@@ -303,14 +611,18 @@ class ThreadSafeVaultData:
             if data:
                 # Load vaults
                 for name, vault_dict in data.get('vaults', {}).items():
-                    self._vaults[name] = VaultInfo.from_dict(vault_dict)
+                    vault = VaultInfo.from_dict(vault_dict)
+                    self._vaults[name] = vault
+                    if vault.first_scan_completed:
+                        self._first_scan_done.add(vault.address)
                     self._previous_positions[vault_dict['address']] = {}
-                    self._last_alerts[vault_dict['address']] = {}
+                self._rebuild_snapshot()
                 
                 # Load settings
                 self._confluence_threshold = data.get('confluence_threshold', 1)
                 self._confluence_window_minutes = data.get('confluence_window_minutes', 10)
                 self._cooldown_minutes = data.get('cooldown_minutes', 5)
+                self._cooldown_seconds = self._cooldown_minutes * 60
                 
                 version = data.get('version', 'unknown')
                 saved_at = data.get('saved_at', 'unknown')
@@ -329,7 +641,7 @@ class ThreadSafeVaultData:
         """Thread-safe vault addition with validation"""
         with self._lock:
             # Validate address format
-            if not BotConfig.HYPERLIQUID_ADDRESS_PATTERN.match(address):
+            if not is_valid_address(address):
                 return False, "Invalid address format. Must be 0x followed by 40 hex characters."
             
             # Check for duplicate name
@@ -337,14 +649,14 @@ class ThreadSafeVaultData:
                 return False, f"A vault with name '{name}' already exists."
             
             # Check for duplicate address
-            for existing_vault in self._vaults.values():
-                if existing_vault.address.lower() == address.lower():
-                    return False, f"This address is already monitored as '{existing_vault.name}'."
+            existing_vault = self._vault_by_address(address)
+            if existing_vault is not None:
+                return False, f"This address is already monitored as '{existing_vault.name}'."
             
             # Add vault
             self._vaults[name] = VaultInfo(address, name)
             self._previous_positions[address] = {}
-            self._last_alerts[address] = {}
+            self._rebuild_snapshot()
             
             # Save immediately
             self._save_data()
@@ -359,7 +671,11 @@ class ThreadSafeVaultData:
                 vault_info = self._vaults[name]
                 del self._vaults[name]
                 self._previous_positions.pop(vault_info.address, None)
-                self._last_alerts.pop(vault_info.address, None)
+                self._first_scan_done.discard(vault_info.address)
+                self._position_fingerprints.pop(vault_info.address, None)
+                for key in [k for k in self._cooldown_expiry if k[0] == vault_info.address]:
+                    del self._cooldown_expiry[key]
+                self._rebuild_snapshot()
                 
                 self._save_data()
                 logger.info(f"Removed vault: {name}")
@@ -371,103 +687,206 @@ class ThreadSafeVaultData:
         with self._lock:
             return self._vaults.get(name)
     
-    def get_active_vaults(self) -> List[VaultInfo]:
-        """Thread-safe active vault list"""
-        with self._lock:
-            return [v for v in self._vaults.values() if v.is_active]
+    def get_active_vaults(self) -> Tuple[VaultInfo, ...]:
+        """Cached active vaults, only refiltered when membership or an active flag changes"""
+        return self._active_vaults
+    
+    def get_inactive_vaults(self) -> Tuple[VaultInfo, ...]:
+        """Cached deactivated vaults, for the health loop's reactivation pass"""
+        return self._inactive_vaults
+    
+    def get_active_count(self) -> int:
+        """Number of active vaults without building a list"""
+        return len(self._active_vaults)
     
     def get_vault_list(self) -> List[VaultInfo]:
-        """Thread-safe vault list"""
-        with self._lock:
-            return list(self._vaults.values())
+        """Vault list built from the membership snapshot"""
+        return list(self._snapshot)
+    
+    def _vault_by_address(self, vault_address: str) -> Optional[VaultInfo]:
+        """Case-insensitive address lookup - caller must hold the lock"""
+        return self._vaults_by_address.get(vault_address.lower())
     
     def mark_vault_failure(self, vault_address: str):
         """Thread-safe failure marking"""
         with self._lock:
-            for vault in self._vaults.values():
-                if vault.address == vault_address:
-                    vault.consecutive_failures += 1
-                    if vault.consecutive_failures >= 3:
-                        vault.is_active = False
-                        logger.warning(f"Deactivating vault {vault.name} after {vault.consecutive_failures} failures")
-                    self._safe_save()
-                    break
+            vault = self._vault_by_address(vault_address)
+            if vault is None:
+                return
+            vault.consecutive_failures += 1
+            if vault.consecutive_failures >= 3 and vault.is_active:
+                self._set_active(vault, False)
+                logger.warning(f"Deactivating vault {vault.name} after {vault.consecutive_failures} failures")
+                self._safe_save()
+            else:
+                self._dirty = True
     
     def mark_vault_success(self, vault_address: str, response_time: float = 0.0):
         """Thread-safe success marking with performance tracking"""
         with self._lock:
-            for vault in self._vaults.values():
-                if vault.address == vault_address:
-                    vault.consecutive_failures = 0
-                    vault.last_successful_check = datetime.now()
-                    vault.is_active = True
-                    vault.total_api_calls += 1
-                    
-                    # Update average response time
-                    if vault.total_api_calls == 1:
-                        vault.avg_response_time = response_time
-                    else:
-                        total_calls = vault.total_api_calls
-                        vault.avg_response_time = (
-                            (vault.avg_response_time * (total_calls - 1) + response_time) 
-                            / total_calls
-                        )
-                    
-                    self._safe_save()
-                    break
+            vault = self._vault_by_address(vault_address)
+            if vault is None:
+                return
+            vault.consecutive_failures = 0
+            vault.last_successful_check = datetime.now()
+            self._set_active(vault, True)
+            vault.total_api_calls += 1
+            
+            # Update average response time
+            if vault.total_api_calls == 1:
+                vault.avg_response_time = response_time
+            else:
+                total_calls = vault.total_api_calls
+                vault.avg_response_time = (
+                    (vault.avg_response_time * (total_calls - 1) + response_time) 
+                    / total_calls
+                )
+            
+            self._dirty = True
+    
+    def reactivate_vault(self, vault_address: str):
+        """Give a deactivated vault another chance and reset its failure count"""
+        with self._lock:
+            vault = self._vault_by_address(vault_address)
+            if vault is None:
+                return
+            self._set_active(vault, True)
+            vault.consecutive_failures = 0
+            self._safe_save()
+    
+    def is_first_scan_done(self, vault_address: str) -> bool:
+        """Single set lookup gating alerts for a vault"""
+        return vault_address in self._first_scan_done
     
     def complete_first_scan(self, vault_address: str):
         """Mark first scan as completed to enable alerts"""
         with self._lock:
-            for vault in self._vaults.values():
-                if vault.address == vault_address:
-                    vault.first_scan_completed = True
-                    self._safe_save()
-                    logger.info(f"First scan completed for {vault.name} - alerts now enabled")
-                    break
-    
-    def is_cooldown_active(self, vault_address: str, coin: str) -> bool:
-        """Thread-safe cooldown check"""
+            vault = self._vault_by_address(vault_address)
+            if vault is None:
+                return
+            vault.first_scan_completed = True
+            self._first_scan_done.add(vault.address)
+            self._safe_save()
+            logger.info(f"First scan completed for {vault.name} - alerts now enabled")
+    
+    def get_positions_fingerprint(self, vault_address: str) -> Optional[int]:
+        """Fingerprint of the last scan whose positions were fully processed"""
         with self._lock:
-            if vault_address not in self._last_alerts:
-                return False
-            if coin not in self._last_alerts[vault_address]:
-                return False
-            
-            last_alert = self._last_alerts[vault_address][coin]
-            cooldown_end = last_alert + timedelta(minutes=self._cooldown_minutes)
-            return datetime.now() < cooldown_end
+            return self._position_fingerprints.get(vault_address)
     
-    def set_cooldown(self, vault_address: str, coin: str):
-        """Thread-safe cooldown setting"""
+    def set_positions_fingerprint(self, vault_address: str, fingerprint: Optional[int]):
+        """Remember the fingerprint of a processed scan, or forget it when unknown"""
         with self._lock:
-            if vault_address not in self._last_alerts:
-                self._last_alerts[vault_address] = {}
-            self._last_alerts[vault_address][coin] = datetime.now()
+            if fingerprint is None:
+                self._position_fingerprints.pop(vault_address, None)
+            else:
+                self._position_fingerprints[vault_address] = fingerprint
     
-    def add_trade_event(self, event: TradeEvent):
-        """Thread-safe trade event addition"""
+    def set_cooldowns(self, vault_addresses: Set[str], coin: str, now: Optional[float] = None):
+        """Thread-safe cooldown setting for every vault in a confluence at once"""
+        if now is None:
+            now = time.monotonic()
+        with self._lock:
+            expiry = now + self._cooldown_seconds
+            for vault_address in vault_addresses:
+                self._cooldown_expiry[(vault_address, coin)] = expiry
+    
+    def prune_expired_cooldowns(self, now: Optional[float] = None) -> int:
+        """Drop expired cooldown entries and return how many were removed"""
+        if now is None:
+            now = time.monotonic()
         with self._lock:
-            self._trade_events.append(event)
-            # Clean up old events
-            cutoff_time = datetime.now() - timedelta(minutes=self._confluence_window_minutes)
-            self._trade_events = [e for e in self._trade_events if e.timestamp > cutoff_time]
+            expired = [key for key, expiry in self._cooldown_expiry.items() if expiry <= now]
+            for key in expired:
+                del self._cooldown_expiry[key]
+            return len(expired)
+    
+    def _uncount_event(self, event: TradeEvent):
+        """Drop an evicted event from its coin's vault counter - caller must hold the lock"""
+        counts = self._vault_counts_by_coin[event.coin]
+        counts[event.vault_name] -= 1
+        if counts[event.vault_name] <= 0:
+            del counts[event.vault_name]
+    
+    def _evict_expired_events(self, coin: str, cutoff_time: datetime) -> Optional[deque]:
+        """Pop events at or before cutoff from the coin's deque - caller must hold the lock"""
+        events = self._events_by_coin.get(coin)
+        if events is None:
+            return None
+        while events and events[0].timestamp <= cutoff_time:
+            self._uncount_event(events.popleft())
+        if not events:
+            del self._events_by_coin[coin]
+            del self._vault_counts_by_coin[coin]
+            return None
+        return events
+    
+    def _append_event(self, event: TradeEvent, events: Optional[deque]):
+        """Append to the coin's deque and vault counter - caller must hold the lock and have evicted"""
+        if events is None:
+            events = self._events_by_coin[event.coin] = deque(maxlen=BotConfig.MAX_EVENTS_PER_COIN)
+            self._vault_counts_by_coin[event.coin] = Counter()
+        elif len(events) == events.maxlen:
+            self._uncount_event(events[0])  # append() is about to push it out
+        events.append(event)
+        self._vault_counts_by_coin[event.coin][event.vault_name] += 1
+    
+    def record_trade_event(self, event: TradeEvent,
+                           now: Optional[float] = None) -> Optional[Tuple[int, bool]]:
+        """Cooldown check, confluence count and append under one lock; None while the coin is cooling down
+        
+        Returns how many distinct vaults were already in the window and whether event's vault was one of them.
+        """
+        if now is None:
+            now = time.monotonic()
+        with self._lock:
+            if self._cooldown_expiry.get((event.vault_address, event.coin), 0.0) > now:
+                return None
+            cutoff_time = event.timestamp - timedelta(minutes=self._confluence_window_minutes)
+            events = self._evict_expired_events(event.coin, cutoff_time)
+            if events:
+                counts = self._vault_counts_by_coin[event.coin]
+                existing_unique_vaults, already_counted = len(counts), event.vault_name in counts
+            else:
+                existing_unique_vaults, already_counted = 0, False
+            self._append_event(event, events)
+            return existing_unique_vaults, already_counted
     
     def get_confluence_events(self, coin: str, current_time: datetime) -> List[TradeEvent]:
-        """Thread-safe confluence event retrieval"""
+        """Thread-safe confluence event retrieval, oldest first"""
         with self._lock:
             cutoff_time = current_time - timedelta(minutes=self._confluence_window_minutes)
-            return [e for e in self._trade_events if e.coin == coin and e.timestamp > cutoff_time]
+            events = self._evict_expired_events(coin, cutoff_time)
+            return list(events) if events else []
+    
+    def prune_expired_events(self, current_time: datetime) -> int:
+        """Expire events for every coin, including ones no longer being traded"""
+        with self._lock:
+            cutoff_time = current_time - timedelta(minutes=self._confluence_window_minutes)
+            coins_before = len(self._events_by_coin)
+            for coin in list(self._events_by_coin):
+                self._evict_expired_events(coin, cutoff_time)
+            return coins_before - len(self._events_by_coin)
     
     def get_previous_positions(self, vault_address: str) -> Dict[str, PositionData]:
-        """Thread-safe previous position retrieval"""
+        """Stored positions for a vault, not copied - read-only for callers; apply_position_deltas is the writer"""
         with self._lock:
-            return self._previous_positions.get(vault_address, {}).copy()
+            return self._previous_positions.get(vault_address, {})
+    
+    def apply_position_deltas(self, vault_address: str, changed: Dict[str, Optional[PositionData]]):
+        """Apply changed coins in place - None removes a closed position"""
+        with self._lock:
+            positions = self._previous_positions.setdefault(vault_address, {})
+            for coin, position in changed.items():
+                if position is None:
+                    positions.pop(coin, None)
+                else:
+                    positions[coin] = position
     
     def update_previous_positions(self, vault_address: str, positions: Dict[str, PositionData]):
-        """Thread-safe position update"""
+        """Take ownership of a freshly built positions dict - the caller must not reuse it"""
         with self._lock:
-            self._previous_positions[vault_address] = positions.copy()
+            self._previous_positions[vault_address] = positions
 
 class HyperliquidAdvancedBot:
     """Production-grade Hyperliquid monitoring bot with proper concurrency control"""
@@ -475,60 +894,73 @@ class HyperliquidAdvancedBot:
     def __init__(self, telegram_bot_token: str, chat_id: str):
         self.bot_token = telegram_bot_token
         self.chat_id = chat_id
-        self.info = Info(constants.MAINNET_API_URL, skip_ws=True)
+        self._bot = Bot(token=telegram_bot_token)
+        self._alert_queue: asyncio.Queue = asyncio.Queue(maxsize=BotConfig.ALERT_QUEUE_SIZE)
+        self._alert_consumer_task: Optional[asyncio.Task] = None
+        self._info_url = f"{constants.MAINNET_API_URL}/info"
+        self._session: Optional[aiohttp.ClientSession] = None
         self.vault_data = ThreadSafeVaultData()
-        self.monitoring_task: Optional[asyncio.Task] = None
-        self.health_check_task: Optional[asyncio.Task] = None
+        self.monitoring_task: Optional[asyncio.Task] = None  # Supervises the monitoring and health loops
         self._monitoring_lock = asyncio.Lock()
         self._api_semaphore = asyncio.Semaphore(BotConfig.MAX_CONCURRENT_OPERATIONS)
+
+        # Bind hot-path config once so the polling loop reads instance attributes
+        self._max_retries = BotConfig.MAX_RETRIES
+        self._timeout = BotConfig.API_TIMEOUT_SECONDS
+        self._delay_base = BotConfig.RETRY_DELAY_BASE
+        self._slow_threshold = BotConfig.MAX_API_RESPONSE_TIME
+        self._max_concurrent = BotConfig.MAX_CONCURRENT_OPERATIONS
+        self._check_interval = BotConfig.VAULT_CHECK_INTERVAL
         
+        # Shared limiter for every outbound Telegram call (replies and alerts)
+        self._tg_bucket = AsyncTokenBucket(
+            rate=BotConfig.TELEGRAM_RATE_PER_SECOND,
+            capacity=BotConfig.TELEGRAM_BURST
+        )
+        # Per-host pacing for Hyperliquid /info, on top of the concurrency semaphore
+        self._api_bucket = AsyncTokenBucket(
+            rate=BotConfig.API_RATE_PER_SECOND,
+            capacity=BotConfig.API_BURST
+        )
+    
+    async def _reply(self, update: Update, text: str, **kwargs):
+        """Rate-limited reply that splits oversized messages on paragraph boundaries"""
+        result = None
+        for chunk in split_message(text):
+            async with self._tg_bucket:
+                result = await update.message.reply_text(chunk, **kwargs)
+        return result
+
     # Command handlers with improved error handling
     async def start_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /start command with auto-monitoring"""
         try:
             # Auto-start monitoring if vaults exist
-            if self.vault_data.vaults and not self.vault_data.is_monitoring:
+            if self.vault_data.snapshot() and not self.vault_data.is_monitoring:
                 await self.start_monitoring()
             
-            vault_count = len(self.vault_data.vaults)
-            active_count = len(self.vault_data.get_active_vaults())
-            
-            welcome_message = (
-                "🤖 *Advanced Hyperliquid Position Monitor v2\\.2*\n\n"
-                "*🆕 Production\\-Grade Features:*\n"
-                "• Thread\\-safe operations\n"
-                "• Atomic data persistence\n"
-                "• Batch processing for 10\\+ vaults\n"
-                "• Smart first\\-scan filtering\n"
-                "• Enhanced error recovery\n\n"
-                "*Commands:*\n"
-                "/add\\_vault \\<address\\> \\<name\\> \\- Add vault\n"
-                "/list\\_vaults \\- Show monitored vaults\n"
-                "/remove\\_vault \\<name\\> \\- Remove vault\n"
-                "/backup \\- Manual backup\n"
-                "/status \\- Bot status\n"
-                "/performance \\- API metrics\n"
-                "/setvaults \\<number\\> \\- Set confluence threshold\n"
-                "/set\\_window \\<minutes\\> \\- Set time window\n"
-                "/health \\- System health\n\n"
-                f"*Current Status:*\n"
-                f"• Vaults: {active_count}/{vault_count}\n"
-                f"• Monitoring: {'🟢 Active' if self.vault_data.is_monitoring else '🔴 Stopped'}\n"
-                f"• Confluence: {self.vault_data.confluence_threshold} vault\\(s\\)\n\n"
-                "🚀 Ready for production use\\!"
+            vault_count = len(self.vault_data.snapshot())
+            active_count = self.vault_data.get_active_count()
+            
+            welcome_message = WELCOME_MESSAGE_TEMPLATE.format(
+                active_count=active_count,
+                vault_count=vault_count,
+                monitoring='🟢 Active' if self.vault_data.is_monitoring else '🔴 Stopped',
+                confluence_threshold=self.vault_data.confluence_threshold
             )
-            await update.message.reply_text(welcome_message, parse_mode='MarkdownV2')
+            await self._reply(update, welcome_message, parse_mode='MarkdownV2')
             logger.info(f"Start command executed by user {update.effective_user.id}")
             
         except Exception as e:
             logger.error(f"Error in start command: {e}")
-            await update.message.reply_text("🤖 Advanced Hyperliquid Monitor v2.2 - Production Ready!\nUse /add_vault <address> <name> to start.")
+            await self._reply(update, "🤖 Advanced Hyperliquid Monitor v2.2 - Production Ready!\nUse /add_vault <address> <name> to start.")
     
     async def add_vault_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /add_vault command with comprehensive validation"""
         try:
             if len(context.args) < 2:
-                await update.message.reply_text(
+                await self._reply(
+                    update,
                     "Please provide both address and name:\n`/add_vault <address> <name>`", 
                     parse_mode='MarkdownV2'
                 )
@@ -539,7 +971,7 @@ class HyperliquidAdvancedBot:
             
             # Validate name length
             if len(name) > 20:
-                await update.message.reply_text("❌ Vault name must be 20 characters or less")
+                await self._reply(update, "❌ Vault name must be 20 characters or less")
                 return
             
             success, message = self.vault_data.add_vault(address, name)
@@ -556,7 +988,7 @@ class HyperliquidAdvancedBot:
                     f"📊 *Monitoring* will begin automatically\n"
                     f"💾 *Saved* to persistent storage"
                 )
-                await update.message.reply_text(response_message, parse_mode='MarkdownV2')
+                await self._reply(update, response_message, parse_mode='MarkdownV2')
                 
                 # Start monitoring if not already running
                 if not self.vault_data.is_monitoring:
@@ -565,11 +997,11 @@ class HyperliquidAdvancedBot:
                 logger.info(f"Successfully added vault: {name} ({address})")
             else:
                 escaped_error = escape_markdown_v2(message)
-                await update.message.reply_text(f"❌ {escaped_error}")
+                await self._reply(update, f"❌ {escaped_error}")
                 
         except Exception as e:
             logger.error(f"Error in add_vault command: {e}")
-            await update.message.reply_text("❌ Error adding vault. Please check the address format and try again.")
+            await self._reply(update, "❌ Error adding vault. Please check the address format and try again.")
     
     async def list_vaults_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /list_vaults command with enhanced display"""
@@ -577,42 +1009,42 @@ class HyperliquidAdvancedBot:
             vaults = self.vault_data.get_vault_list()
             if not vaults:
                 message = "📭 No vaults being monitored\\.\n\nUse /add\\_vault \\<address\\> \\<name\\> to add one\\."
-                await update.message.reply_text(message, parse_mode='MarkdownV2')
+                await self._reply(update, message, parse_mode='MarkdownV2')
                 return
             
-            active_vaults = [v for v in vaults if v.is_active]
+            active_count = self.vault_data.get_active_count()
             
-            message = f"📊 *Monitored Vaults:* {len(active_vaults)}/{len(vaults)} active\n\n"
+            parts = [f"📊 *Monitored Vaults:* {active_count}/{len(vaults)} active\n\n"]
             
             for i, vault in enumerate(vaults, 1):
                 status_icon = "🟢" if vault.is_active else "🔴"
-                escaped_name = escape_markdown_v2(vault.name)
-                escaped_address = escape_markdown_v2(f"{vault.address[:8]}...{vault.address[-6:]}")
                 
                 # Performance stats
                 avg_time = f"{vault.avg_response_time:.1f}s" if vault.avg_response_time > 0 else "N/A"
                 calls = vault.total_api_calls
                 
-                message += f"{i}\\. {status_icon} *{escaped_name}*\n"
-                message += f"   `{escaped_address}`\n"
-                message += f"   📊 {calls} calls, {escape_markdown_v2(avg_time)} avg\n\n"
+                parts.append(
+                    f"{i}\\. {status_icon} *{vault.display_name_md}*\n"
+                    f"   `{vault.display_address_md}`\n"
+                    f"   📊 {calls} calls, {escape_markdown_v2(avg_time)} avg\n\n"
+                )
             
-            await update.message.reply_text(message, parse_mode='MarkdownV2')
+            await self._reply(update, ''.join(parts), parse_mode='MarkdownV2')
             
         except Exception as e:
             logger.error(f"Error in list_vaults command: {e}")
             vaults = self.vault_data.get_vault_list()
-            simple_message = f"📊 Monitored vaults ({len(vaults)}):\n"
-            for i, vault in enumerate(vaults, 1):
-                status = "🟢" if vault.is_active else "🔴"
-                simple_message += f"{i}. {status} {vault.name} ({vault.address[:8]}...)\n"
-            await update.message.reply_text(simple_message)
+            simple_message = f"📊 Monitored vaults ({len(vaults)}):\n" + ''.join(
+                f"{i}. {'🟢' if vault.is_active else '🔴'} {vault.name} ({vault.address[:8]}...)\n"
+                for i, vault in enumerate(vaults, 1)
+            )
+            await self._reply(update, simple_message)
     
     async def remove_vault_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /remove_vault command with improved error messages"""
         try:
             if not context.args:
-                await update.message.reply_text("Please provide vault name: /remove\\_vault \\<name\\>", parse_mode='MarkdownV2')
+                await self._reply(update, "Please provide vault name: /remove\\_vault \\<name\\>", parse_mode='MarkdownV2')
                 return
             
             name = " ".join(context.args).strip()
@@ -620,38 +1052,39 @@ class HyperliquidAdvancedBot:
             if self.vault_data.remove_vault(name):
                 escaped_name = escape_markdown_v2(name)
                 message = f"✅ Removed vault: *{escaped_name}*\n💾 Changes saved to persistent storage"
-                await update.message.reply_text(message, parse_mode='MarkdownV2')
+                await self._reply(update, message, parse_mode='MarkdownV2')
                 logger.info(f"Removed vault: {name}")
             else:
                 # Improved error message with available vault names
-                available_vaults = list(self.vault_data.vaults.keys())
+                available_vaults = [v.display_name_md for v in self.vault_data.snapshot()]
                 if available_vaults:
-                    vault_list = "\\n• ".join([escape_markdown_v2(v) for v in available_vaults])
+                    vault_list = "\n• ".join(available_vaults)
                     message = f"❌ Vault '{escape_markdown_v2(name)}' not found\\.\n\n*Available vaults:*\n• {vault_list}\n\n💡 *Note:* Names are case\\-sensitive"
-                    await update.message.reply_text(message, parse_mode='MarkdownV2')
+                    await self._reply(update, message, parse_mode='MarkdownV2')
                 else:
-                    await update.message.reply_text("❌ No vaults are currently being monitored")
+                    await self._reply(update, "❌ No vaults are currently being monitored")
                     
         except Exception as e:
             logger.error(f"Error in remove_vault command: {e}")
-            await update.message.reply_text("Error removing vault. Please try again.")
+            await self._reply(update, "Error removing vault. Please try again.")
     
     async def backup_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /backup command - show vault configuration for manual backup"""
         try:
-            if not self.vault_data.vaults:
-                await update.message.reply_text("❌ No vaults to backup")
+            vaults = self.vault_data.snapshot()
+            if not vaults:
+                await self._reply(update, "❌ No vaults to backup")
                 return
             
             # Create human-readable backup
             vault_list = ""
-            for i, (name, vault) in enumerate(self.vault_data.vaults.items(), 1):
+            for i, vault in enumerate(vaults, 1):
                 status = "✅" if vault.is_active else "❌"
                 first_scan = "✅" if vault.first_scan_completed else "🔄"
-                vault_list += f"{i}. {status}{first_scan} {name}: {vault.address}\n"
+                vault_list += f"{i}. {status}{first_scan} {vault.name}: {vault.address}\n"
             
             backup_message = (
-                f"💾 **VAULT BACKUP v2.2** ({len(self.vault_data.vaults)} vaults)\n\n"
+                f"💾 **VAULT BACKUP v2.2** ({len(vaults)} vaults)\n\n"
                 f"**Settings:**\n"
                 f"• Alert when: {self.vault_data.confluence_threshold} vault(s) trade same token\n"
                 f"• Time window: {self.vault_data.confluence_window_minutes} minutes\n"
@@ -660,22 +1093,22 @@ class HyperliquidAdvancedBot:
                 f"**Performance:**\n"
                 f"• API Success Rate: {self.vault_data.performance.success_rate:.1f}%\n"
                 f"• Total API Calls: {self.vault_data.performance.total_api_calls}\n\n"
-                f"**Backup created:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+                f"**Backup created:** {format_clock(datetime.now(), '%Y-%m-%d %H:%M:%S')}\n\n"
                 f"💡 **Save this message** - you can use it to restore your vaults if needed!"
             )
             
-            await update.message.reply_text(backup_message)
-            logger.info(f"Manual backup provided for {len(self.vault_data.vaults)} vaults")
+            await self._reply(update, backup_message)
+            logger.info(f"Manual backup provided for {len(vaults)} vaults")
             
         except Exception as e:
             logger.error(f"Error in backup command: {e}")
-            await update.message.reply_text("Error creating backup")
+            await self._reply(update, "Error creating backup")
     
     async def performance_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /performance command with enhanced metrics"""
         try:
             perf = self.vault_data.performance
-            active_vaults = self.vault_data.get_active_vaults()
+            active_count = self.vault_data.get_active_count()
             
             success_rate = f"{perf.success_rate:.1f}%"
             avg_time = f"{perf.avg_response_time:.2f}s" if perf.avg_response_time > 0 else "N/A"
@@ -696,24 +1129,24 @@ class HyperliquidAdvancedBot:
                 f"**Failed:** {perf.failed_calls}\n"
                 f"**Avg Response:** {avg_time}\n"
                 f"**Uptime:** {uptime_str}\n\n"
-                f"**Active Vaults:** {len(active_vaults)}\n"
-                f"**Batch Size:** {BotConfig.BATCH_SIZE}\n"
-                f"**Check Interval:** {BotConfig.VAULT_CHECK_INTERVAL}s\n\n"
+                f"**Active Vaults:** {active_count}\n"
+                f"**Max Concurrent:** {self._max_concurrent}\n"
+                f"**Check Interval:** {self._check_interval}s\n\n"
                 f"💡 Metrics reset every hour for accuracy"
             )
             
-            await update.message.reply_text(message)
+            await self._reply(update, message)
             
         except Exception as e:
             logger.error(f"Error in performance command: {e}")
-            await update.message.reply_text("Error retrieving performance metrics")
+            await self._reply(update, "Error retrieving performance metrics")
     
     async def health_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /health command with system diagnostics"""
         try:
             vaults = self.vault_data.get_vault_list()
-            active_vaults = self.vault_data.get_active_vaults()
-            inactive_vaults = [v for v in vaults if not v.is_active]
+            active_count = self.vault_data.get_active_count()
+            inactive_count = len(vaults) - active_count
             
             # System health indicators
             health_score = 100
@@ -723,9 +1156,9 @@ class HyperliquidAdvancedBot:
                 health_score -= 50
                 issues.append("Monitoring stopped")
             
-            if len(inactive_vaults) > 0:
-                health_score -= min(30, len(inactive_vaults) * 10)
-                issues.append(f"{len(inactive_vaults)} inactive vaults")
+            if inactive_count > 0:
+                health_score -= min(30, inactive_count * 10)
+                issues.append(f"{inactive_count} inactive vaults")
             
             if self.vault_data.performance.success_rate < 90:
                 health_score -= 20
@@ -747,8 +1180,8 @@ class HyperliquidAdvancedBot:
                 f"**Overall Health:** {health_icon} {health_status} ({health_score}%)\n\n"
                 f"**Vault Status:**\n"
                 f"• Total: {len(vaults)}\n"
-                f"• Active: {len(active_vaults)}\n"
-                f"• Inactive: {len(inactive_vaults)}\n\n"
+                f"• Active: {active_count}\n"
+                f"• Inactive: {inactive_count}\n\n"
                 f"**Monitoring:** {'🟢 Running' if self.vault_data.is_monitoring else '🔴 Stopped'}\n"
                 f"**API Health:** {self.vault_data.performance.success_rate:.1f}% success\n\n"
             )
@@ -759,152 +1192,164 @@ class HyperliquidAdvancedBot:
                     message += f"⚠️ {issue}\n"
                 message += "\n"
             
-            message += f"**Last Check:** {datetime.now().strftime('%H:%M:%S')}"
+            message += f"**Last Check:** {format_clock(datetime.now())}"
             
-            await update.message.reply_text(message)
+            await self._reply(update, message)
             
         except Exception as e:
             logger.error(f"Error in health command: {e}")
-            await update.message.reply_text("Error retrieving health status")
+            await self._reply(update, "Error retrieving health status")
     
     async def set_vault_number_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /setvaults command for confluence threshold"""
         try:
             if not context.args:
-                await update.message.reply_text("Please provide number: /setvaults \\<number\\>", parse_mode='MarkdownV2')
+                await self._reply(update, "Please provide number: /setvaults \\<number\\>", parse_mode='MarkdownV2')
                 return
             
             try:
                 threshold = int(context.args[0])
                 if threshold < 1:
-                    await update.message.reply_text("❌ Confluence threshold must be at least 1")
+                    await self._reply(update, "❌ Confluence threshold must be at least 1")
                     return
                 
                 if threshold > 10:
-                    await update.message.reply_text("❌ Confluence threshold cannot exceed 10 for stability")
+                    await self._reply(update, "❌ Confluence threshold cannot exceed 10 for stability")
                     return
                 
                 self.vault_data.confluence_threshold = threshold
                 
-                escaped_threshold = escape_markdown_v2(str(threshold))
+                escaped_threshold = escape_int(threshold)
                 message = f"✅ Confluence threshold set to: *{escaped_threshold}* vault\\(s\\)\n💾 Setting saved to persistent storage"
-                await update.message.reply_text(message, parse_mode='MarkdownV2')
+                await self._reply(update, message, parse_mode='MarkdownV2')
                 logger.info(f"Confluence threshold set to: {threshold}")
                 
             except ValueError:
-                await update.message.reply_text("❌ Please provide a valid number")
+                await self._reply(update, "❌ Please provide a valid number")
                 
         except Exception as e:
             logger.error(f"Error in setvaults command: {e}")
-            await update.message.reply_text("Error setting confluence threshold.")
+            await self._reply(update, "Error setting confluence threshold.")
     
     async def set_window_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /set_window command"""
         try:
             if not context.args:
-                await update.message.reply_text("Please provide minutes: /set\\_window \\<minutes\\>", parse_mode='MarkdownV2')
+                await self._reply(update, "Please provide minutes: /set\\_window \\<minutes\\>", parse_mode='MarkdownV2')
                 return
             
             try:
                 minutes = int(context.args[0])
                 if minutes < 1:
-                    await update.message.reply_text("❌ Time window must be at least 1 minute")
+                    await self._reply(update, "❌ Time window must be at least 1 minute")
                     return
                 
                 if minutes > 1440:  # 24 hours max
-                    await update.message.reply_text("❌ Time window cannot exceed 1440 minutes (24 hours)")
+                    await self._reply(update, "❌ Time window cannot exceed 1440 minutes (24 hours)")
                     return
                 
                 self.vault_data.confluence_window_minutes = minutes
                 
-                escaped_minutes = escape_markdown_v2(str(minutes))
+                escaped_minutes = escape_int(minutes)
                 message = f"✅ Confluence window set to: *{escaped_minutes}* minute\\(s\\)\n💾 Setting saved to persistent storage"
-                await update.message.reply_text(message, parse_mode='MarkdownV2')
+                await self._reply(update, message, parse_mode='MarkdownV2')
                 logger.info(f"Confluence window set to: {minutes} minutes")
                 
             except ValueError:
-                await update.message.reply_text("❌ Please provide a valid number")
+                await self._reply(update, "❌ Please provide a valid number")
                 
         except Exception as e:
             logger.error(f"Error in set_window command: {e}")
-            await update.message.reply_text("Error setting confluence window.")
+            await self._reply(update, "Error setting confluence window.")
     
     async def show_settings_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /show_settings command with enhanced display"""
         try:
             vaults = self.vault_data.get_vault_list()
-            active_vaults = self.vault_data.get_active_vaults()
             
             status_icon = "🟢" if self.vault_data.is_monitoring else "🔴"
             status_text = "Active" if self.vault_data.is_monitoring else "Stopped"
             
-            confluence_threshold = escape_markdown_v2(str(self.vault_data.confluence_threshold))
-            confluence_window = escape_markdown_v2(str(self.vault_data.confluence_window_minutes))
-            cooldown = escape_markdown_v2(str(self.vault_data.cooldown_minutes))
-            vault_count = escape_markdown_v2(str(len(vaults)))
-            active_count = escape_markdown_v2(str(len(active_vaults)))
-            
-            message = (
-                f"⚙️ *Bot Settings v2\\.2*\n\n"
-                f"*Status:* {status_icon} {status_text}\n"
-                f"*Vaults:* {active_count}/{vault_count} active\n\n"
-                f"*Detection Settings:*\n"
-                f"• Confluence Threshold: {confluence_threshold} vault\\(s\\)\n"
-                f"• Confluence Window: {confluence_window} minute\\(s\\)\n"
-                f"• Anti\\-spam Cooldown: {cooldown} minute\\(s\\)\n\n"
-                f"*Production Config:*\n"
-                f"• Check Interval: {escape_markdown_v2(str(BotConfig.VAULT_CHECK_INTERVAL))} seconds\n"
-                f"• Batch Size: {escape_markdown_v2(str(BotConfig.BATCH_SIZE))} vaults\n"
-                f"• Max Retries: {escape_markdown_v2(str(BotConfig.MAX_RETRIES))}\n"
-                f"• API Timeout: {escape_markdown_v2(str(BotConfig.API_TIMEOUT_SECONDS))}s\n\n"
-                f"*Features:*\n"
-                f"• Tracks: Position SIZE changes\n"
-                f"• Thread\\-safe operations\n"
-                f"• Atomic persistence\n"
-                f"• Smart first\\-scan filtering"
+            message = SETTINGS_MESSAGE_TEMPLATE.format(
+                status_icon=status_icon,
+                status_text=status_text,
+                active_count=escape_int(self.vault_data.get_active_count()),
+                vault_count=escape_int(len(vaults)),
+                confluence_threshold=escape_int(self.vault_data.confluence_threshold),
+                confluence_window=escape_int(self.vault_data.confluence_window_minutes),
+                cooldown=escape_int(self.vault_data.cooldown_minutes)
             )
-            await update.message.reply_text(message, parse_mode='MarkdownV2')
+            await self._reply(update, message, parse_mode='MarkdownV2')
             
         except Exception as e:
             logger.error(f"Error in show_settings command: {e}")
             vaults = self.vault_data.get_vault_list()
-            active_vaults = self.vault_data.get_active_vaults()
             
             message = (
                 f"⚙️ Bot Settings v2.2:\n"
                 f"Status: {'Active' if self.vault_data.is_monitoring else 'Stopped'}\n"
-                f"Vaults: {len(active_vaults)}/{len(vaults)} active\n"
+                f"Vaults: {self.vault_data.get_active_count()}/{len(vaults)} active\n"
                 f"Confluence: {self.vault_data.confluence_threshold} vaults\n"
                 f"Window: {self.vault_data.confluence_window_minutes} minutes\n"
                 f"Cooldown: {self.vault_data.cooldown_minutes} minutes\n"
-                f"Check Interval: {BotConfig.VAULT_CHECK_INTERVAL}s"
+                f"Check Interval: {self._check_interval}s"
             )
-            await update.message.reply_text(message)
+            await self._reply(update, message)
     
     async def status_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /status command - show comprehensive status"""
         await self.show_settings_command(update, context)
     
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Lazily create the keep-alive session shared by every vault request"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=BotConfig.HTTP_CONNECTION_LIMIT,
+                keepalive_timeout=BotConfig.HTTP_KEEPALIVE_SECONDS,
+                ttl_dns_cache=BotConfig.HTTP_DNS_CACHE_SECONDS
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self._timeout)
+            )
+        return self._session
+    
+    async def _fetch_user_state(self, address: str) -> Dict:
+        """POST a clearinghouseState query over the shared session"""
+        payload = {"type": "clearinghouseState", "user": address}
+        await self._api_bucket.acquire()
+        async with self._get_session().post(self._info_url, json=payload) as response:
+            response.raise_for_status()
+            return json_loads(await response.read())
+    
+    async def initialize(self):
+        """Initialize the alert Bot - Bot.shutdown() is a no-op on a Bot that was never initialized"""
+        await self._bot.initialize()
+    
+    async def close(self):
+        """Release the shared HTTP session and the alert Bot's connection pool"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        try:
+            await self._bot.shutdown()
+        except Exception as e:
+            logger.debug(f"Error shutting down alert bot: {e}")
+    
     async def safe_api_call(self, vault_info: VaultInfo, operation: str) -> Optional[Dict]:
         """Production-grade API call with comprehensive error handling"""
         async with self._api_semaphore:  # Limit concurrent API calls
-            start_time = time.time()
+            start_ns = time.monotonic_ns()
             
-            for attempt in range(BotConfig.MAX_RETRIES):
+            for attempt in range(self._max_retries):
                 try:
                     self.vault_data.performance.total_api_calls += 1
                     
-                    # Use asyncio timeout with proper error handling
-                    user_state = await asyncio.wait_for(
-                        asyncio.get_event_loop().run_in_executor(
-                            None, 
-                            lambda: self.info.user_state(vault_info.address)
-                        ),
-                        timeout=BotConfig.API_TIMEOUT_SECONDS
-                    )
+                    # The session's ClientTimeout bounds the request
+                    user_state = await self._fetch_user_state(vault_info.address)
                     
                     # Record success
-                    response_time = time.time() - start_time
+                    response_time = (time.monotonic_ns() - start_ns) / 1e9
                     self.vault_data.performance.successful_calls += 1
                     
                     # Update performance metrics safely
@@ -919,78 +1364,85 @@ class HyperliquidAdvancedBot:
                     
                     self.vault_data.mark_vault_success(vault_info.address, response_time)
                     
-                    if response_time > BotConfig.MAX_API_RESPONSE_TIME:
+                    if response_time > self._slow_threshold:
                         logger.warning(f"Slow API response for {vault_info.name}: {response_time:.2f}s")
                     
                     return user_state
                     
                 except asyncio.TimeoutError:
-                    logger.warning(f"Timeout on attempt {attempt + 1}/{BotConfig.MAX_RETRIES} for {vault_info.name}")
+                    logger.warning(f"Timeout on attempt {attempt + 1}/{self._max_retries} for {vault_info.name}")
                     self.vault_data.performance.failed_calls += 1
                     
+                except aiohttp.ClientResponseError as e:
+                    self.vault_data.performance.failed_calls += 1
+                    if e.status == 429:
+                        # Rate limits are per IP, so drain the shared bucket and let it pace the retry
+                        delay = retry_after_seconds(e.headers or {}, self._delay_base ** (attempt + 1))
+                        logger.warning(f"⏳ Rate limited on attempt {attempt + 1}/{self._max_retries} for {vault_info.name}, backing off {delay:.1f}s")
+                        self._api_bucket.pause(delay)
+                        continue
+                    logger.error(f"API error on attempt {attempt + 1}/{self._max_retries} for {vault_info.name}: {e}")
+                    
                 except Exception as e:
-                    logger.error(f"API error on attempt {attempt + 1}/{BotConfig.MAX_RETRIES} for {vault_info.name}: {e}")
+                    logger.error(f"API error on attempt {attempt + 1}/{self._max_retries} for {vault_info.name}: {e}")
                     self.vault_data.performance.failed_calls += 1
                 
                 # Exponential backoff between retries
-                if attempt < BotConfig.MAX_RETRIES - 1:
-                    delay = BotConfig.RETRY_DELAY_BASE ** (attempt + 1)
+                if attempt < self._max_retries - 1:
+                    delay = self._delay_base ** (attempt + 1)
                     logger.info(f"Retrying {vault_info.name} in {delay}s...")
                     await asyncio.sleep(delay)
             
             # All retries failed
             self.vault_data.mark_vault_failure(vault_info.address)
-            logger.error(f"All {BotConfig.MAX_RETRIES} retries failed for {vault_info.name}")
+            logger.error(f"All {self._max_retries} retries failed for {vault_info.name}")
             return None
     
-    async def get_vault_positions(self, vault_info: VaultInfo) -> Dict[str, PositionData]:
-        """Get vault positions with enhanced error handling"""
+    def iter_position_sizes(self, vault_info: VaultInfo,
+                            user_state: Dict) -> Iterator[Tuple[str, Decimal, Dict]]:
+        """Yield (coin, size, raw position) for each open position - sizes only, no PositionData"""
+        if not user_state or 'assetPositions' not in user_state:
+            return
+        
+        for position in user_state['assetPositions']:
+            try:
+                pos_data = position['position']
+                size_str = pos_data.get('szi', '0')
+                
+                if size_str and size_str != '0':
+                    yield pos_data['coin'], abs(Decimal(str(size_str))), pos_data
+            except Exception as e:
+                logger.warning(f"Error parsing position in {vault_info.name}: {e}")
+                continue
+    
+    def _build_position(self, coin: str, size: Decimal, pos_data: Dict, now: datetime) -> PositionData:
+        """Full PositionData for a parsed size, with entry price and value when present"""
+        # Extract additional data safely
+        entry_price = None
+        position_value = None
+        
         try:
-            positions = {}
-            
-            user_state = await self.safe_api_call(vault_info, "get_positions")
-            if user_state is None:
-                return None  # API failure
-            
-            if user_state and 'assetPositions' in user_state:
-                for position in user_state['assetPositions']:
-                    try:
-                        pos_data = position['position']
-                        size_str = pos_data.get('szi', '0')
-                        
-                        if size_str and size_str != '0':
-                            coin = pos_data['coin']
-                            size = abs(Decimal(str(size_str)))
-                            
-                            # Extract additional data safely
-                            entry_price = None
-                            position_value = None
-                            
-                            try:
-                                if 'entryPx' in pos_data and pos_data['entryPx']:
-                                    entry_price = Decimal(str(pos_data['entryPx']))
-                                if 'positionValue' in pos_data and pos_data['positionValue']:
-                                    position_value = Decimal(str(pos_data['positionValue']))
-                            except Exception as e:
-                                logger.debug(f"Error parsing additional position data for {coin}: {e}")
-                            
-                            positions[coin] = PositionData(
-                                coin=coin,
-                                size=size,
-                                timestamp=datetime.now(),
-                                entry_price=entry_price,
-                                position_value=position_value
-                            )
-                    except Exception as e:
-                        logger.warning(f"Error parsing position in {vault_info.name}: {e}")
-                        continue
-            
-            return positions
-            
+            if 'entryPx' in pos_data and pos_data['entryPx']:
+                entry_price = Decimal(str(pos_data['entryPx']))
+            if 'positionValue' in pos_data and pos_data['positionValue']:
+                position_value = Decimal(str(pos_data['positionValue']))
         except Exception as e:
-            logger.error(f"Error fetching positions for {vault_info.name}: {e}")
-            self.vault_data.mark_vault_failure(vault_info.address)
-            return None  # API failure
+            logger.debug(f"Error parsing additional position data for {coin}: {e}")
+        
+        return PositionData(
+            coin=coin,
+            size=size,
+            timestamp=now,
+            entry_price=entry_price,
+            position_value=position_value,
+            size_scaled=scale_size(size)
+        )
+    
+    def iter_vault_positions(self, vault_info: VaultInfo, user_state: Dict,
+                             now: datetime) -> Iterator[Tuple[str, PositionData]]:
+        """Yield (coin, position) pairs one at a time from a clearinghouse state response"""
+        for coin, size, pos_data in self.iter_position_sizes(vault_info, user_state):
+            yield coin, self._build_position(coin, size, pos_data, now)
     
     async def check_vault_changes(self, vault_info: VaultInfo):
         """Enhanced vault change detection with first-scan filtering"""
@@ -999,89 +1451,105 @@ class HyperliquidAdvancedBot:
                 logger.debug(f"Skipping inactive vault: {vault_info.name}")
                 return
             
-            current_positions = await self.get_vault_positions(vault_info)
+            user_state = await self.safe_api_call(vault_info, "get_positions")
             
-            # Handle API failure (None means API failed, empty dict {} means no positions)
-            if current_positions is None:
+            # Handle API failure (None means API failed, empty state means no positions)
+            if user_state is None:
                 logger.warning(f"Skipping {vault_info.name} due to API failure")
                 return
             
+            first_scan_done = self.vault_data.is_first_scan_done(vault_info.address)
+            
+            # Position sizes unchanged since the last processed scan - nothing to diff
+            fingerprint = positions_fingerprint(user_state)
+            if (first_scan_done and fingerprint is not None
+                    and fingerprint == self.vault_data.get_positions_fingerprint(vault_info.address)):
+                logger.debug(f"{vault_info.name}: positions unchanged, skipping diff")
+                return
+            
             previous_positions = self.vault_data.get_previous_positions(vault_info.address)
+            # Read the clocks once; every event, alert and cooldown from this scan shares them
+            now = datetime.now()
+            now_monotonic = time.monotonic()
             
             # CRITICAL FIX: Handle first scan to prevent alert flood
-            if not vault_info.first_scan_completed:
+            if not first_scan_done:
+                current_positions = dict(self.iter_vault_positions(vault_info, user_state, now))
                 logger.info(f"🔍 First scan of {vault_info.name}: Found {len(current_positions)} positions, skipping alerts")
                 self.vault_data.update_previous_positions(vault_info.address, current_positions)
+                self.vault_data.set_positions_fingerprint(vault_info.address, fingerprint)
                 self.vault_data.complete_first_scan(vault_info.address)
                 return
             
-            # Check for position changes
-            all_coins = set(current_positions.keys()) | set(previous_positions.keys())
-            changes_detected = 0
+            # Diff sizes against the previous scan as they are parsed, so the
+            # response is walked once and PositionData is only built for coins
+            # whose size moved by more than rounding noise. Sub-threshold moves
+            # keep the old size so drift still adds up to a change.
+            current_coins = set()
+            current_positions = {}
+            for coin, size, pos_data in self.iter_position_sizes(vault_info, user_state):
+                current_coins.add(coin)
+                if abs(scale_size(size) - position_size_scaled(previous_positions, coin)) > size_epsilon_scaled(coin):
+                    current_positions[coin] = self._build_position(coin, size, pos_data, now)
+            changed_coins = list(current_positions)
+            
+            # Closed coins come from a C-level key-view difference
+            changed_coins.extend(
+                coin for coin in previous_positions.keys() - current_coins
+                if previous_positions[coin].size_scaled > size_epsilon_scaled(coin)
+            )
+            changes_detected = len(changed_coins)
             
-            for coin in all_coins:
-                current_pos = current_positions.get(coin)
-                previous_pos = previous_positions.get(coin)
+            for coin in changed_coins:
+                current_size = position_size(current_positions, coin)
+                previous_size = position_size(previous_positions, coin)
+                
+                # Create trade event
+                trade_event = TradeEvent(
+                    vault_name=vault_info.name,
+                    vault_address=vault_info.address,
+                    coin=coin,
+                    old_size=previous_size,
+                    new_size=current_size,
+                    timestamp=now
+                )
                 
-                current_size = current_pos.size if current_pos else Decimal('0')
-                previous_size = previous_pos.size if previous_pos else Decimal('0')
+                # Cooldown check, confluence count (BEFORE adding current event) and append in one locked step
+                recorded = self.vault_data.record_trade_event(trade_event, now_monotonic)
+                if recorded is None:
+                    logger.info(f"Skipping alert for {coin} on {vault_info.name} - cooldown active")
+                    continue
+                existing_unique_vaults, already_counted = recorded
                 
-                # Check if position size changed
-                if current_size != previous_size:
-                    changes_detected += 1
-                    
-                    # Check cooldown
-                    if self.vault_data.is_cooldown_active(vault_info.address, coin):
-                        logger.info(f"Skipping alert for {coin} on {vault_info.name} - cooldown active")
-                        continue
-                    
-                    # Create trade event
-                    trade_event = TradeEvent(
-                        vault_name=vault_info.name,
-                        vault_address=vault_info.address,
-                        coin=coin,
-                        old_size=previous_size,
-                        new_size=current_size,
-                        timestamp=datetime.now()
-                    )
-                    
-                    # FIXED: Check confluence BEFORE adding current event
-                    existing_confluence_events = self.vault_data.get_confluence_events(coin, trade_event.timestamp)
-                    existing_unique_vaults = len(set(e.vault_name for e in existing_confluence_events))
+                # Add current event to the count
+                total_unique_vaults = existing_unique_vaults if already_counted else existing_unique_vaults + 1
+                
+                logger.info(f"📈 Confluence for {coin}: {existing_unique_vaults} existing + {vault_info.name} = {total_unique_vaults} total (threshold: {self.vault_data.confluence_threshold})")
+                
+                # Only alert if confluence threshold is met
+                if total_unique_vaults >= self.vault_data.confluence_threshold:
+                    # The window now ends with the current event, so it is the full confluence
+                    all_confluence_events = self.vault_data.get_confluence_events(coin, trade_event.timestamp)
                     
                     # Enhanced logging for confluence detection
-                    if existing_confluence_events:
-                        existing_vault_names = [e.vault_name for e in existing_confluence_events]
-                        logger.info(f"🔍 Confluence check for {coin}: Found {existing_unique_vaults} existing vault(s): {existing_vault_names}")
-                        for event in existing_confluence_events:
-                            minutes_ago = (trade_event.timestamp - event.timestamp).total_seconds() / 60
-                            logger.info(f"  📊 {event.vault_name}: {event.trade_type} {event.size_change} size, {minutes_ago:.1f} minutes ago")
+                    for event in all_confluence_events[:-1]:
+                        minutes_ago = (trade_event.timestamp - event.timestamp).total_seconds() / 60
+                        logger.info(f"  📊 {event.vault_name}: {event.trade_type} {event.size_change_str} size, {minutes_ago:.1f} minutes ago")
                     
-                    # Add current event to the count (but not to the list yet)
-                    total_unique_vaults = existing_unique_vaults
-                    current_vault_already_counted = any(e.vault_name == vault_info.name for e in existing_confluence_events)
-                    if not current_vault_already_counted:
-                        total_unique_vaults += 1
+                    await self.send_confluence_alert(trade_event, all_confluence_events, now=now)
                     
-                    logger.info(f"📈 Confluence for {coin}: {existing_unique_vaults} existing + {vault_info.name} = {total_unique_vaults} total (threshold: {self.vault_data.confluence_threshold})")
-                    
-                    # Add to trade events AFTER confluence check
-                    self.vault_data.add_trade_event(trade_event)
-                    
-                    # Only alert if confluence threshold is met
-                    if total_unique_vaults >= self.vault_data.confluence_threshold:
-                        # Get final confluence events including current one for alert
-                        all_confluence_events = self.vault_data.get_confluence_events(coin, trade_event.timestamp)
-                        await self.send_confluence_alert(trade_event, all_confluence_events)
-                        
-                        # Set cooldown for all involved vaults
-                        for event in all_confluence_events:
-                            vault = self.vault_data.get_vault_by_name(event.vault_name)
-                            if vault:
-                                self.vault_data.set_cooldown(vault.address, coin)
-            
-            # Update previous positions
-            self.vault_data.update_previous_positions(vault_info.address, current_positions)
+                    # Set cooldown for all involved vaults
+                    self.vault_data.set_cooldowns(
+                        {event.vault_address for event in all_confluence_events}, coin, now_monotonic
+                    )
+            
+            # Update previous positions with just the coins that changed
+            if changed_coins:
+                self.vault_data.apply_position_deltas(
+                    vault_info.address,
+                    {coin: current_positions.get(coin) for coin in changed_coins}
+                )
+            self.vault_data.set_positions_fingerprint(vault_info.address, fingerprint)
             
             if changes_detected > 0:
                 logger.info(f"📊 {vault_info.name}: Detected {changes_detected} position changes")
@@ -1090,25 +1558,21 @@ class HyperliquidAdvancedBot:
             logger.error(f"Error checking changes for vault {vault_info.name}: {e}")
             self.vault_data.mark_vault_failure(vault_info.address)
     
-    async def send_confluence_alert(self, trigger_event: TradeEvent, all_events: List[TradeEvent]):
+    async def send_confluence_alert(self, trigger_event: TradeEvent, all_events: List[TradeEvent],
+                                    now: Optional[datetime] = None):
         """Send confluence alert when multiple vaults trade the same token"""
+        if now is None:
+            now = datetime.now()
+        unique_vaults = {e.vault_name for e in all_events}
+        confluence_count = len(unique_vaults)
+        
         try:
-            # Get unique vaults involved
-            unique_vaults = list(set(e.vault_name for e in all_events))
-            confluence_count = len(unique_vaults)
             
             # Determine alert emoji based on trade type
-            if trigger_event.trade_type == "OPEN":
-                emoji = "🟢"
-            elif trigger_event.trade_type == "CLOSE":
-                emoji = "🔴"
-            elif trigger_event.trade_type == "INCREASE":
-                emoji = "📈"
-            else:  # DECREASE
-                emoji = "📉"
+            emoji = TRADE_EMOJI.get(trigger_event.trade_type, "📊")
             
             # Enhanced alert with better formatting
-            message = (
+            parts = [
                 f"{emoji} **CONFLUENCE DETECTED v2.2**\n\n"
                 f"**Token:** {trigger_event.coin}\n"
                 f"**Vaults Trading:** {confluence_count} within {self.vault_data.confluence_window_minutes}min\n\n"
@@ -1116,28 +1580,30 @@ class HyperliquidAdvancedBot:
                 f"• Vault: {trigger_event.vault_name}\n"
                 f"• Action: {trigger_event.trade_type}\n"
                 f"• Size: {trigger_event.old_size} → {trigger_event.new_size}\n"
-                f"• Change: {trigger_event.size_change}\n\n"
+                f"• Change: {trigger_event.size_change_str}\n\n"
                 f"**All Participating Vaults:**\n"
-            )
+            ]
+            
+            # Earliest event per vault (reversed so the first occurrence wins)
+            by_vault = {e.vault_name: e for e in reversed(all_events)}
             
             # Add vault details with timing
             for i, vault_name in enumerate(sorted(unique_vaults), 1):
-                # Find the event for this vault
-                vault_event = next((e for e in all_events if e.vault_name == vault_name), None)
+                vault_event = by_vault.get(vault_name)
                 if vault_event:
                     time_diff = (trigger_event.timestamp - vault_event.timestamp).total_seconds() / 60
                     if time_diff < 1:
                         timing = "just now"
                     else:
                         timing = f"{time_diff:.0f}m ago"
-                    message += f"{i}. {vault_name} ({vault_event.trade_type}, {timing})\n"
+                    parts.append(f"{i}. {vault_name} ({vault_event.trade_type}, {timing})\n")
                 else:
-                    message += f"{i}. {vault_name}\n"
+                    parts.append(f"{i}. {vault_name}\n")
             
-            message += f"\n**Time:** {datetime.now().strftime('%H:%M:%S')}"
+            parts.append(f"\n**Time:** {format_clock(now)}")
             
-            await self.send_alert(message)
-            logger.info(f"🚨 Confluence alert sent: {trigger_event.coin} - {confluence_count} vaults")
+            await self.send_alert(''.join(parts))
+            logger.info(f"🚨 Confluence alert queued: {trigger_event.coin} - {confluence_count} vaults")
             
         except Exception as e:
             logger.error(f"Error sending confluence alert: {e}")
@@ -1145,7 +1611,7 @@ class HyperliquidAdvancedBot:
             try:
                 simple_message = (
                     f"🚨 CONFLUENCE: {trigger_event.coin}\n"
-                    f"Vaults: {len(set(e.vault_name for e in all_events))}\n"
+                    f"Vaults: {confluence_count}\n"
                     f"Trigger: {trigger_event.vault_name} - {trigger_event.trade_type}\n"
                     f"Size: {trigger_event.old_size} → {trigger_event.new_size}"
                 )
@@ -1154,17 +1620,94 @@ class HyperliquidAdvancedBot:
                 logger.error(f"Error sending fallback alert: {e2}")
     
     async def send_alert(self, message: str):
-        """Send alert message to Telegram with fallback"""
+        """Queue an alert for the background sender so callers never wait on Telegram"""
+        self._ensure_alert_consumer()
+        await self._alert_queue.put(message)
+    
+    def _ensure_alert_consumer(self):
+        """Start the alert sender task if it is not already running"""
+        if self._alert_consumer_task is None or self._alert_consumer_task.done():
+            self._alert_consumer_task = asyncio.create_task(self._consume_alerts())
+    
+    async def _next_alert_batch(self) -> List[str]:
+        """Wait for one alert, then collect whatever else arrives within ALERT_BATCH_WAIT"""
+        messages = [await self._alert_queue.get()]
+        deadline = time.monotonic() + BotConfig.ALERT_BATCH_WAIT
+        while len(messages) < BotConfig.ALERT_BATCH_SIZE:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                messages.append(await asyncio.wait_for(self._alert_queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+        return messages
+    
+    async def _consume_alerts(self):
+        """Drain the alert queue, merging bursts into as few Telegram messages as fit"""
+        while True:
+            messages = await self._next_alert_batch()
+            try:
+                for batch in coalesce_alerts(messages):
+                    await self._deliver_alert(batch)
+            finally:
+                for _ in messages:
+                    self._alert_queue.task_done()
+    
+    async def _deliver_alert(self, message: str):
+        """Send alert message to Telegram, backing off when rate limited"""
         try:
-            bot = Bot(token=self.bot_token)
-            await bot.send_message(chat_id=self.chat_id, text=message)
+            for chunk in split_message(message):
+                for attempt in range(BotConfig.ALERT_SEND_RETRIES):
+                    try:
+                        async with self._tg_bucket:
+                            await self._bot.send_message(chat_id=self.chat_id, text=chunk)
+                        break
+                    except RetryAfter as e:
+                        # Telegram says exactly how long to wait - a guess would re-trigger the limit
+                        if attempt == BotConfig.ALERT_SEND_RETRIES - 1:
+                            raise
+                        delay = float(e.retry_after) + 0.1
+                        logger.warning(f"Telegram rate limit hit, retrying alert in {delay:.1f}s")
+                        await asyncio.sleep(delay)
+                    except BadRequest:
+                        raise  # Subclass of NetworkError, but a rejected message will not succeed on retry
+                    except NetworkError as e:
+                        # Timeouts and dropped connections: jittered exponential backoff
+                        if attempt == BotConfig.ALERT_SEND_RETRIES - 1:
+                            raise
+                        delay = random.uniform(0, 2 ** (attempt + 1))
+                        logger.warning(f"Network error sending alert ({e}), retrying in {delay:.1f}s")
+                        await asyncio.sleep(delay)
             logger.info(f"Alert sent: {message[:50]}...")
         except Exception as e:
             logger.error(f"Error sending alert: {e}")
             # No fallback needed - just log the error
     
+    async def _stop_alert_consumer(self):
+        """Give queued alerts a chance to go out, then stop the sender task"""
+        if self._alert_consumer_task is None:
+            return
+        try:
+            await asyncio.wait_for(self._alert_queue.join(), timeout=BotConfig.ALERT_DRAIN_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.warning(f"Dropping {self._alert_queue.qsize()} unsent alert(s) on shutdown")
+        self._alert_consumer_task.cancel()
+        try:
+            await self._alert_consumer_task
+        except asyncio.CancelledError:
+            pass
+        self._alert_consumer_task = None
+    
+    async def _check_vault_guarded(self, vault_info: VaultInfo):
+        """Run check_vault_changes so one vault's failure never cancels its siblings"""
+        try:
+            await self.check_vault_changes(vault_info)
+        except Exception as e:
+            logger.error(f"Task failed for vault {vault_info.name}: {e}")
+    
     async def monitoring_loop(self):
-        """Production-grade monitoring loop with batch optimization"""
+        """Production-grade monitoring loop with concurrent vault checks"""
         logger.info("🚀 Starting production-grade vault monitoring loop v2.2...")
         
         while self.vault_data.is_monitoring:
@@ -1172,47 +1715,29 @@ class HyperliquidAdvancedBot:
                 active_vaults = self.vault_data.get_active_vaults()
                 if not active_vaults:
                     logger.info("No active vaults to monitor, waiting...")
-                    await asyncio.sleep(BotConfig.VAULT_CHECK_INTERVAL)
+                    await asyncio.sleep(self._check_interval)
                     continue
                 
-                cycle_start = time.time()
+                cycle_start_ns = time.monotonic_ns()
                 logger.info(f"🔍 Checking {len(active_vaults)} active vault(s) for position changes...")
                 
-                # Process vaults in batches for better performance
-                for i in range(0, len(active_vaults), BotConfig.BATCH_SIZE):
-                    batch = active_vaults[i:i + BotConfig.BATCH_SIZE]
-                    batch_tasks = []
-                    
-                    for vault_info in batch:
-                        if not self.vault_data.is_monitoring:
-                            break
-                        task = asyncio.create_task(self.check_vault_changes(vault_info))
-                        batch_tasks.append(task)
-                    
-                    # Wait for batch to complete with proper error handling
-                    if batch_tasks:
-                        results = await asyncio.gather(*batch_tasks, return_exceptions=True)
-                        # Check for any exceptions in the batch
-                        for i, result in enumerate(results):
-                            if isinstance(result, Exception):
-                                vault_name = batch[i].name if i < len(batch) else "unknown"
-                                logger.error(f"Task failed for vault {vault_name}: {result}")
-                                # Don't let one vault failure stop everything
-                    
-                    # Delay between batches
-                    if i + BotConfig.BATCH_SIZE < len(active_vaults):
-                        await asyncio.sleep(BotConfig.VAULT_DELAY)
+                # Check every vault concurrently - the API semaphore and the shared
+                # session's connection pool bound how many requests are in flight
+                async with asyncio.TaskGroup() as tg:
+                    for vault_info in active_vaults:
+                        tg.create_task(self._check_vault_guarded(vault_info))
                 
-                cycle_time = time.time() - cycle_start
+                cycle_time = (time.monotonic_ns() - cycle_start_ns) / 1e9
                 logger.info(f"✅ Monitoring cycle completed in {cycle_time:.2f}s")
                 
-                # Wait for next cycle
-                await asyncio.sleep(BotConfig.VAULT_CHECK_INTERVAL)
+                # Wait out the rest of the interval so cycles start on a fixed cadence
+                # rather than drifting by however long this one took
+                await asyncio.sleep(max(0.0, self._check_interval - cycle_time))
                 
             except Exception as e:
                 logger.error(f"Critical error in monitoring loop: {e}")
                 logger.error(f"Monitoring state: {self.vault_data.is_monitoring}")
-                logger.error(f"Active vaults: {len(self.vault_data.get_active_vaults())}")
+                logger.error(f"Active vaults: {self.vault_data.get_active_count()}")
                 
                 # Log full exception traceback for debugging
                 import traceback
@@ -1222,26 +1747,40 @@ class HyperliquidAdvancedBot:
                 
         logger.warning("🛑 Monitoring loop exited - this should not happen during normal operation!")
         logger.warning(f"Final monitoring state: {self.vault_data.is_monitoring}")
-        logger.warning(f"Final active vaults: {len(self.vault_data.get_active_vaults())}")
+        logger.warning(f"Final active vaults: {self.vault_data.get_active_count()}")
     
     async def health_monitor_loop(self):
         """Monitor system health and auto-recover"""
         while self.vault_data.is_monitoring:
             try:
                 # Reset performance metrics every hour
-                if (datetime.now() - self.vault_data.performance.last_reset).total_seconds() > 3600:
+                if time.monotonic() - self.vault_data.performance.last_reset_monotonic > 3600:
                     logger.info("Resetting performance metrics")
                     self.vault_data.performance = PerformanceMetrics()
                 
+                now = datetime.now()
+                
                 # Reactivate vaults that have been down for too long
-                for vault in self.vault_data.vaults.values():
-                    if not vault.is_active and vault.consecutive_failures >= 3:
+                for vault in self.vault_data.get_inactive_vaults():
+                    if vault.consecutive_failures >= 3:
                         if vault.last_successful_check:
-                            time_since_last_success = datetime.now() - vault.last_successful_check
+                            time_since_last_success = now - vault.last_successful_check
                             if time_since_last_success.total_seconds() > 1800:  # 30 minutes
                                 logger.info(f"Reactivating vault {vault.name} after 30 minutes")
-                                vault.is_active = True
-                                vault.consecutive_failures = 0
+                                self.vault_data.reactivate_vault(vault.address)
+                
+                # Persist accumulated per-vault stats in one write
+                self.vault_data.flush_if_dirty()
+                
+                # Drop confluence history for coins that went quiet
+                emptied = self.vault_data.prune_expired_events(now)
+                if emptied:
+                    logger.debug(f"Dropped expired trade events for {emptied} coin(s)")
+                
+                # Sweep cooldowns that have already expired
+                pruned = self.vault_data.prune_expired_cooldowns()
+                if pruned:
+                    logger.debug(f"Pruned {pruned} expired cooldown(s)")
                 
                 await asyncio.sleep(300)  # Check every 5 minutes
                 
@@ -1249,16 +1788,23 @@ class HyperliquidAdvancedBot:
                 logger.error(f"Error in health monitor: {e}")
                 await asyncio.sleep(300)
     
+    async def _supervise_monitoring(self):
+        """Run the monitoring and health loops as one unit that starts and stops together"""
+        async with asyncio.TaskGroup() as tg:
+            tg.create_task(self.monitoring_loop())
+            tg.create_task(self.health_monitor_loop())
+    
     async def start_monitoring(self):
         """Start monitoring with proper concurrency control"""
         async with self._monitoring_lock:
             if not self.vault_data.is_monitoring:
                 self.vault_data.is_monitoring = True
-                self.monitoring_task = asyncio.create_task(self.monitoring_loop())
+                self._ensure_alert_consumer()
+                self.monitoring_task = asyncio.create_task(self._supervise_monitoring())
                 
                 try:
-                    vault_count = len(self.vault_data.vaults)
-                    active_count = len(self.vault_data.get_active_vaults())
+                    vault_count = len(self.vault_data.snapshot())
+                    active_count = self.vault_data.get_active_count()
                     
                     startup_message = (
                         f"🚀 **Production Monitoring Started v2.2**\n\n"
@@ -1267,14 +1813,14 @@ class HyperliquidAdvancedBot:
                         f"• Active Vaults: {active_count}\n"
                         f"• Confluence: {self.vault_data.confluence_threshold} vault(s)\n"
                         f"• Window: {self.vault_data.confluence_window_minutes} min\n"
-                        f"• Batch Size: {BotConfig.BATCH_SIZE} vaults\n"
-                        f"• Check Interval: {BotConfig.VAULT_CHECK_INTERVAL}s\n\n"
+                        f"• Max Concurrent: {self._max_concurrent} vaults\n"
+                        f"• Check Interval: {self._check_interval}s\n\n"
                         f"**Production Features:**\n"
                         f"• Thread-safe operations\n"
                         f"• Atomic persistence\n"
                         f"• Smart first-scan filtering\n"
                         f"• Enhanced error recovery\n\n"
-                        f"**Started:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+                        f"**Started:** {format_clock(datetime.now(), '%Y-%m-%d %H:%M:%S')}"
                     )
                     await self.send_alert(startup_message)
                     logger.info("🚀 Production monitoring started successfully")
@@ -1288,6 +1834,7 @@ class HyperliquidAdvancedBot:
         async with self._monitoring_lock:
             self.vault_data.is_monitoring = False
             
+            # Cancelling the supervisor tears down both loops through its TaskGroup
             if self.monitoring_task:
                 self.monitoring_task.cancel()
                 try:
@@ -1296,19 +1843,22 @@ class HyperliquidAdvancedBot:
                     pass
                 self.monitoring_task = None
             
-            if self.health_check_task:
-                self.health_check_task.cancel()
-                try:
-                    await self.health_check_task
-                except asyncio.CancelledError:
-                    pass
-                self.health_check_task = None
-            
+            await self._stop_alert_consumer()
+            self.vault_data.flush_if_dirty()
             logger.info("🛑 Monitoring stopped and cleaned up")
 
 # Rest of the command handlers and methods would continue...
 # I'll implement the remaining methods following the same production-grade patterns
 
+def install_uvloop() -> bool:
+    """Switch asyncio to uvloop when it is installed; call before asyncio.run"""
+    try:
+        import uvloop
+    except ImportError:
+        return False
+    uvloop.install()
+    return True
+
 async def main():
     """Production-ready main function with enhanced error handling"""
     # Get environment variables
@@ -1323,10 +1873,11 @@ async def main():
     
     # Create production bot instance
     vault_bot = HyperliquidAdvancedBot(telegram_bot_token, chat_id)
+    await vault_bot.initialize()
     
     # Auto-start monitoring if vaults exist from previous session
-    if vault_bot.vault_data.vaults and not vault_bot.vault_data.is_monitoring:
-        logger.info(f"🔄 Auto-starting monitoring for {len(vault_bot.vault_data.vaults)} persisted vaults")
+    if vault_bot.vault_data.snapshot() and not vault_bot.vault_data.is_monitoring:
+        logger.info(f"🔄 Auto-starting monitoring for {len(vault_bot.vault_data.snapshot())} persisted vaults")
         await vault_bot.start_monitoring()
     
     # Create Telegram application
@@ -1353,9 +1904,16 @@ async def main():
         await application.start()
         await application.updater.start_polling()
         
-        # Keep the bot running
-        while True:
-            await asyncio.sleep(1)
+        # Keep the bot running until SIGINT/SIGTERM, without waking the loop in between
+        stop_event = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, stop_event.set)
+            except NotImplementedError:
+                pass  # Windows: KeyboardInterrupt still ends the run
+        await stop_event.wait()
+        logger.info("Shutdown signal received")
             
     except KeyboardInterrupt:
         logger.info("Bot stopped by user")
@@ -1365,7 +1923,13 @@ async def main():
         # Cleanup
         if hasattr(vault_bot, 'stop_monitoring'):
             await vault_bot.stop_monitoring()
-        await application.stop()
+        await vault_bot.close()
+        if application.updater.running:
+            await application.updater.stop()
+        if application.running:
+            await application.stop()
+        await application.shutdown()
 
 if __name__ == "__main__":
+    install_uvloop()
     asyncio.run(main())
\ No newline at end of file
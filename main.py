@@ -7,7 +7,7 @@ Launches the advanced Telegram bot with position size tracking and confluence de
 import asyncio
 import sys
 import os
-from bot import main
+from bot import main, install_uvloop
 
 if __name__ == "__main__":
     print("🚀 Starting Advanced Hyperliquid Position Monitor...")
@@ -24,6 +24,7 @@ if __name__ == "__main__":
     
     try:
         # Run the advanced bot
+        install_uvloop()
         asyncio.run(main())
     except KeyboardInterrupt:
         print("\n🛑 Bot stopped by user")